@@ -1,13 +1,17 @@
 from typing import Optional
 
 from .abc import EventQueue
+from .buffer import EventBuffer
 from .db_impl import DbEventQueue
 from .memory_impl import MemoryEventQueue
+from .ring_impl import RingEventQueue
 
 __all__ = [
     "EventQueue",
+    "EventBuffer",
     "DbEventQueue",
     "MemoryEventQueue",
+    "RingEventQueue",
     "get_event_queue",
     "set_event_queue",
 ]
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Sequence, Tuple
 
 from crynux_server.models import TaskEvent
 
@@ -9,6 +9,10 @@ class EventQueue(ABC):
     async def put(self, event: TaskEvent):
         ...
 
+    async def put_batch(self, events: Sequence[TaskEvent]):
+        for event in events:
+            await self.put(event)
+
     @abstractmethod
     async def get(self) -> Tuple[int, TaskEvent]:
         ...
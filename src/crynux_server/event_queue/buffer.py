@@ -0,0 +1,94 @@
+import logging
+from typing import List, Optional
+
+from anyio import Event, move_on_after, sleep
+
+from crynux_server.models import TaskEvent
+
+from .abc import EventQueue
+
+_logger = logging.getLogger(__name__)
+
+
+class EventBuffer(object):
+    # ping-pong buffer between the watcher callbacks and the event queue:
+    # producers append to the front buffer while the flush loop hands the back buffer
+    # to the queue in one put_batch, so the queue is synchronized once per batch
+    # instead of once per event
+    def __init__(
+        self,
+        queue: EventQueue,
+        max_size: int = 64,
+        interval: float = 0.005,
+        retry_delay: float = 1,
+    ) -> None:
+        self.queue = queue
+        self.max_size = max_size
+        self.interval = interval
+        self.retry_delay = retry_delay
+
+        self._front: List[TaskEvent] = []
+        self._back: List[TaskEvent] = []
+
+        self._doorbell: Optional[Event] = None
+
+    def __len__(self) -> int:
+        return len(self._front)
+
+    def append(self, event: TaskEvent):
+        self._front.append(event)
+        # wake the flush loop when the buffer becomes non-empty or full
+        if len(self._front) == 1 or len(self._front) >= self.max_size:
+            if self._doorbell is not None:
+                self._doorbell.set()
+                self._doorbell = None
+
+    async def _wait_doorbell(self):
+        if self._doorbell is None:
+            self._doorbell = Event()
+        await self._doorbell.wait()
+
+    async def flush(self):
+        if len(self._front) == 0:
+            return
+
+        self._front, self._back = self._back, self._front
+        batch = self._back
+        try:
+            await self.queue.put_batch(batch)
+            _logger.debug(f"flush {len(batch)} events to queue")
+        except Exception:
+            # keep the events in order for the next flush. A cancelled put_batch may
+            # already have stored the batch, so it is not restored on cancellation
+            self._front[:0] = batch
+            raise
+        finally:
+            batch.clear()
+
+    async def run(self):
+        try:
+            while True:
+                while len(self._front) == 0:
+                    await self._wait_doorbell()
+
+                with move_on_after(self.interval):
+                    while len(self._front) < self.max_size:
+                        await self._wait_doorbell()
+
+                try:
+                    await self.flush()
+                except Exception as e:
+                    # the events are kept in the buffer, so a failing queue only
+                    # delays them until the next flush
+                    _logger.exception(e)
+                    _logger.error(
+                        f"Flush {len(self._front)} events to queue failed, retry after {self.retry_delay}s."
+                    )
+                    await sleep(self.retry_delay)
+        finally:
+            with move_on_after(5, shield=True):
+                try:
+                    await self.flush()
+                except Exception as e:
+                    _logger.exception(e)
+                    _logger.error(f"Drop {len(self._front)} events when stopping the buffer.")
@@ -1,5 +1,5 @@
 import logging
-from typing import Tuple, Dict
+from typing import Dict, Sequence, Tuple
 
 import sqlalchemy as sa
 from anyio import Condition
@@ -38,6 +38,23 @@ class DbEventQueue(EventQueue):
 
         _logger.debug(f"put event {event} to queue")
 
+    async def put_batch(self, events: Sequence[TaskEvent]):
+        if len(events) == 0:
+            return
+
+        async with self.condition:
+            async with db.session_scope() as sess:
+                sess.add_all(
+                    [
+                        db_models.TaskEvent(kind=event.kind, event=event.model_dump_json())
+                        for event in events
+                    ]
+                )
+                await sess.commit()
+            self.condition.notify(len(events))
+
+        _logger.debug(f"put {len(events)} events to queue")
+
     async def get(self) -> Tuple[int, TaskEvent]:
 
         async with self.condition:
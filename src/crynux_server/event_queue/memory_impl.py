@@ -1,5 +1,5 @@
 from collections import deque
-from typing import Tuple, Optional
+from typing import Optional, Sequence, Tuple
 
 from anyio import Condition
 
@@ -21,6 +21,11 @@ class MemoryEventQueue(EventQueue):
             self.queue.append(event)
             self.condition.notify()
 
+    async def put_batch(self, events: Sequence[TaskEvent]):
+        async with self.condition:
+            self.queue.extend(events)
+            self.condition.notify(len(events))
+
     async def get(self) -> Tuple[int, TaskEvent]:
         async with self.condition:
             while len(self.queue) == 0:
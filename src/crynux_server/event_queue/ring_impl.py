@@ -0,0 +1,94 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from anyio import Event
+
+from crynux_server.models import TaskEvent
+
+from .abc import EventQueue
+
+
+class RingEventQueue(EventQueue):
+    # many producers (the event buffer, task runners' watcher callbacks and put / no_ack
+    # calls) and a single consumer (the task system), all on one event loop. The head and
+    # tail indices need no lock only because put and put_batch never await between checking
+    # the ring and writing to it, so do not add an await there. The consumer sleeps on a
+    # doorbell event while the ring is empty, and a full ring doubles instead of blocking
+
+    def __init__(self, capacity: int = 1024) -> None:
+        assert capacity > 0, "Ring event queue capacity must be positive."
+
+        self._capacity = capacity
+        self._buffer: List[Optional[TaskEvent]] = [None] * capacity
+        self._head = 0
+        self._tail = 0
+
+        self._doorbell: Optional[Event] = None
+
+        self._ack_id = 0
+        self._no_ack_events: Dict[int, TaskEvent] = {}
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def _grow(self):
+        size = len(self)
+        buffer: List[Optional[TaskEvent]] = [None] * (self._capacity * 2)
+        for i in range(size):
+            buffer[i] = self._buffer[(self._head + i) % self._capacity]
+
+        self._buffer = buffer
+        self._capacity *= 2
+        self._head = 0
+        self._tail = size
+
+    def _push(self, event: TaskEvent):
+        if len(self) == self._capacity:
+            self._grow()
+
+        self._buffer[self._tail % self._capacity] = event
+        self._tail += 1
+
+    def _ring(self):
+        if self._doorbell is not None:
+            self._doorbell.set()
+            self._doorbell = None
+
+    async def put(self, event: TaskEvent):
+        self._push(event)
+        self._ring()
+
+    async def put_batch(self, events: Sequence[TaskEvent]):
+        for event in events:
+            self._push(event)
+        self._ring()
+
+    async def get(self) -> Tuple[int, TaskEvent]:
+        while self._head == self._tail:
+            if self._doorbell is None:
+                self._doorbell = Event()
+            await self._doorbell.wait()
+
+        index = self._head % self._capacity
+        event = self._buffer[index]
+        assert event is not None
+        self._buffer[index] = None
+        self._head += 1
+
+        self._ack_id += 1
+        self._no_ack_events[self._ack_id] = event
+        return self._ack_id, event
+
+    async def ack(self, ack_id: int):
+        assert ack_id in self._no_ack_events
+
+        del self._no_ack_events[ack_id]
+
+    async def no_ack(self, ack_id: int):
+        assert ack_id in self._no_ack_events
+
+        event = self._no_ack_events.pop(ack_id)
+        await self.put(event)
@@ -1,6 +1,7 @@
 from .event import (TaskAborted, TaskStarted, TaskEvent, TaskKind,
                     TaskResultCommitmentsReady, TaskResultReady, TaskSuccess,
-                    load_event_from_contracts, load_event_from_json)
+                    load_event_from_contracts, load_event_from_json,
+                    make_event_decoder)
 from .node import (ChainNodeInfo, ChainNodeStatus, GpuInfo, NodeState,
                    NodeStatus, convert_node_status, ChainNetworkNodeInfo)
 from .task import ChainTask, TaskType, RelayTask, TaskState, TaskStatus
@@ -16,6 +17,7 @@ __all__ = [
     "TaskAborted",
     "load_event_from_json",
     "load_event_from_contracts",
+    "make_event_decoder",
     "ChainTask",
     "RelayTask",
     "ChainNodeStatus",
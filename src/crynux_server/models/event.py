@@ -1,4 +1,4 @@
-from typing import List, Literal
+from typing import Callable, Dict, List, Literal
 
 from eth_typing import ChecksumAddress
 from pydantic import BaseModel, Field
@@ -113,55 +113,94 @@ def load_event_from_json(kind: TaskKind, event_json: str) -> TaskEvent:
         raise ValueError(f"unknown event kind {kind} from json")
 
 
-def load_event_from_contracts(event_data: EventData) -> TaskEvent:
-    name = event_data["event"]
-    if name == "TaskPending":
-        return TaskPending(
-            task_id=event_data["args"]["taskId"],
-            task_type=event_data["args"]["taskType"],
-            creator=Web3.to_checksum_address(event_data["args"]["creator"]),
-            task_hash=Web3.to_hex(event_data["args"]["taskHash"]),
-            data_hash=Web3.to_hex(event_data["args"]["dataHash"]),
-        )
-    elif name == "TaskStarted":
-        return TaskStarted(
-            task_id=event_data["args"]["taskId"],
-            task_type=event_data["args"]["taskType"],
-            creator=Web3.to_checksum_address(event_data["args"]["creator"]),
-            selected_node=Web3.to_checksum_address(event_data["args"]["selectedNode"]),
-            task_hash=Web3.to_hex(event_data["args"]["taskHash"]),
-            data_hash=Web3.to_hex(event_data["args"]["dataHash"]),
-            round=event_data["args"]["round"],
-        )
-    elif name == "TaskResultCommitmentsReady":
-        return TaskResultCommitmentsReady(task_id=event_data["args"]["taskId"])
-    elif name == "TaskSuccess":
-        return TaskSuccess(
-            task_id=event_data["args"]["taskId"],
-            result=Web3.to_hex(event_data["args"]["result"]),
-            result_node=Web3.to_checksum_address(event_data["args"]["resultNode"]),
-        )
-    elif name == "TaskAborted":
-        return TaskAborted(
-            task_id=event_data["args"]["taskId"], reason=event_data["args"]["reason"]
-        )
-    elif name == "TaskResultUploaded":
-        return TaskResultUploaded(task_id=event_data["args"]["taskId"])
-    elif name == "TaskNodeSuccess":
-        return TaskNodeSuccess(
-            task_id=event_data["args"]["taskId"],
-            node_address=Web3.to_checksum_address(event_data["args"]["nodeAddress"]),
-            fee=event_data["args"]["fee"],
-        )
-    elif name == "TaskNodeSlashed":
-        return TaskNodeSlashed(
-            task_id=event_data["args"]["taskId"],
-            node_address=Web3.to_checksum_address(event_data["args"]["nodeAddress"]),
-        )
-    elif name == "TaskNodeCancelled":
-        return TaskNodeCancelled(
-            task_id=event_data["args"]["taskId"],
-            node_address=Web3.to_checksum_address(event_data["args"]["nodeAddress"]),
-        )
-    else:
+EventDecoder = Callable[[EventData], TaskEvent]
+
+
+def _decode_task_pending(event_data: EventData) -> TaskEvent:
+    return TaskPending(
+        task_id=event_data["args"]["taskId"],
+        task_type=event_data["args"]["taskType"],
+        creator=Web3.to_checksum_address(event_data["args"]["creator"]),
+        task_hash=Web3.to_hex(event_data["args"]["taskHash"]),
+        data_hash=Web3.to_hex(event_data["args"]["dataHash"]),
+    )
+
+
+def _decode_task_started(event_data: EventData) -> TaskEvent:
+    return TaskStarted(
+        task_id=event_data["args"]["taskId"],
+        task_type=event_data["args"]["taskType"],
+        creator=Web3.to_checksum_address(event_data["args"]["creator"]),
+        selected_node=Web3.to_checksum_address(event_data["args"]["selectedNode"]),
+        task_hash=Web3.to_hex(event_data["args"]["taskHash"]),
+        data_hash=Web3.to_hex(event_data["args"]["dataHash"]),
+        round=event_data["args"]["round"],
+    )
+
+
+def _decode_task_result_commitments_ready(event_data: EventData) -> TaskEvent:
+    return TaskResultCommitmentsReady(task_id=event_data["args"]["taskId"])
+
+
+def _decode_task_success(event_data: EventData) -> TaskEvent:
+    return TaskSuccess(
+        task_id=event_data["args"]["taskId"],
+        result=Web3.to_hex(event_data["args"]["result"]),
+        result_node=Web3.to_checksum_address(event_data["args"]["resultNode"]),
+    )
+
+
+def _decode_task_aborted(event_data: EventData) -> TaskEvent:
+    return TaskAborted(
+        task_id=event_data["args"]["taskId"], reason=event_data["args"]["reason"]
+    )
+
+
+def _decode_task_result_uploaded(event_data: EventData) -> TaskEvent:
+    return TaskResultUploaded(task_id=event_data["args"]["taskId"])
+
+
+def _decode_task_node_success(event_data: EventData) -> TaskEvent:
+    return TaskNodeSuccess(
+        task_id=event_data["args"]["taskId"],
+        node_address=Web3.to_checksum_address(event_data["args"]["nodeAddress"]),
+        fee=event_data["args"]["fee"],
+    )
+
+
+def _decode_task_node_slashed(event_data: EventData) -> TaskEvent:
+    return TaskNodeSlashed(
+        task_id=event_data["args"]["taskId"],
+        node_address=Web3.to_checksum_address(event_data["args"]["nodeAddress"]),
+    )
+
+
+def _decode_task_node_cancelled(event_data: EventData) -> TaskEvent:
+    return TaskNodeCancelled(
+        task_id=event_data["args"]["taskId"],
+        node_address=Web3.to_checksum_address(event_data["args"]["nodeAddress"]),
+    )
+
+
+_event_decoders: Dict[str, EventDecoder] = {
+    "TaskPending": _decode_task_pending,
+    "TaskStarted": _decode_task_started,
+    "TaskResultCommitmentsReady": _decode_task_result_commitments_ready,
+    "TaskSuccess": _decode_task_success,
+    "TaskAborted": _decode_task_aborted,
+    "TaskResultUploaded": _decode_task_result_uploaded,
+    "TaskNodeSuccess": _decode_task_node_success,
+    "TaskNodeSlashed": _decode_task_node_slashed,
+    "TaskNodeCancelled": _decode_task_node_cancelled,
+}
+
+
+def make_event_decoder(name: str) -> EventDecoder:
+    # resolve the decoder once for callbacks that only receive one kind of event
+    if name not in _event_decoders:
         raise ValueError(f"unknown event kind {name} from contracts")
+    return _event_decoders[name]
+
+
+def load_event_from_contracts(event_data: EventData) -> TaskEvent:
+    return make_event_decoder(event_data["event"])(event_data)
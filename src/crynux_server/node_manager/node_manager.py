@@ -7,6 +7,7 @@ from typing import Optional, Type
 from anyio import (TASK_STATUS_IGNORED, Event, create_task_group, fail_after,
                    get_cancelled_exc_class, move_on_after, sleep)
 from anyio.abc import TaskGroup, TaskStatus
+from anyio.streams.memory import MemoryObjectReceiveStream
 from tenacity import (AsyncRetrying, before_sleep_log, stop_after_attempt,
                       stop_never, wait_fixed)
 from web3 import Web3
@@ -15,7 +16,8 @@ from web3.types import EventData
 from crynux_server import models
 from crynux_server.config import Config, wait_privkey
 from crynux_server.contracts import Contracts, set_contracts
-from crynux_server.event_queue import DbEventQueue, EventQueue, set_event_queue
+from crynux_server.event_queue import (DbEventQueue, EventBuffer, EventQueue,
+                                      set_event_queue)
 from crynux_server.relay import Relay, WebRelay, set_relay
 from crynux_server.task import (DbTaskStateCache, InferenceTaskRunner,
                                 TaskStateCache, TaskSystem,
@@ -153,6 +155,7 @@ class NodeManager(object):
 
         self._tg: Optional[TaskGroup] = None
         self._finish_event: Optional[Event] = None
+        self._ready_event: Optional[Event] = None
 
         self._stoped = False
 
@@ -162,6 +165,17 @@ class NodeManager(object):
             self._finish_event = Event()
         return self._finish_event
 
+    @property
+    def ready_event(self) -> Event:
+        # set when the node manager leaves the init stage, whether it has joined the network,
+        # is waiting for enough balance to join, or failed
+        if self._ready_event is None:
+            self._ready_event = Event()
+        return self._ready_event
+
+    def watch_state(self) -> MemoryObjectReceiveStream[models.NodeState]:
+        return self.state_cache.watch_node_state()
+
     async def _init_components(self):
         _logger.info("Initializing node manager components.")
 
@@ -354,12 +368,13 @@ class NodeManager(object):
         assert self._event_queue is not None
         assert self._contracts is not None
 
-        queue = self._event_queue
+        # TaskStarted events are coalesced and pushed to the queue in batches
+        buffer = EventBuffer(self._event_queue)
+        decode = models.make_event_decoder("TaskStarted")
         account = self._contracts.account
 
         async def _push_event(event_data: EventData):
-            event = models.load_event_from_contracts(event_data)
-            await queue.put(event)
+            buffer.append(decode(event_data))
 
         self._watcher.watch_event(
             "task",
@@ -391,29 +406,34 @@ class NodeManager(object):
         # call task_status.started() only once
         task_status_set = False
 
-        async for attemp in AsyncRetrying(
-            stop=stop_never if self._retry else stop_after_attempt(1),
-            wait=wait_fixed(self._retry_delay),
-            reraise=True,
-        ):
-            with attemp:
-                try:
-                    async with create_task_group() as tg:
-                        if not task_status_set:
-                            await tg.start(self._watcher.start)
-                            task_status.started()
-                            task_status_set = True
-                        else:
-                            await self._watcher.start()
-                except Exception as e:
-                    _logger.exception(e)
-                    _logger.error("Cannot watch events from chain, retrying")
-                    with fail_after(5, shield=True):
-                        await self.state_cache.set_node_state(
-                            status=models.NodeStatus.Error,
-                            message="Node manager running error: cannot watch events from chain, retrying...",
-                        )
-                    raise
+        async with create_task_group() as buffer_tg:
+            buffer_tg.start_soon(buffer.run)
+
+            async for attemp in AsyncRetrying(
+                stop=stop_never if self._retry else stop_after_attempt(1),
+                wait=wait_fixed(self._retry_delay),
+                reraise=True,
+            ):
+                with attemp:
+                    try:
+                        async with create_task_group() as tg:
+                            if not task_status_set:
+                                await tg.start(self._watcher.start)
+                                task_status.started()
+                                task_status_set = True
+                            else:
+                                await self._watcher.start()
+                    except Exception as e:
+                        _logger.exception(e)
+                        _logger.error("Cannot watch events from chain, retrying")
+                        with fail_after(5, shield=True):
+                            await self.state_cache.set_node_state(
+                                status=models.NodeStatus.Error,
+                                message="Node manager running error: cannot watch events from chain, retrying...",
+                            )
+                        raise
+
+            buffer_tg.cancel_scope.cancel()
 
     async def _check_time(self):
         assert self._relay is not None
@@ -521,6 +541,8 @@ class NodeManager(object):
                     await self.state_cache.set_node_state(
                         status=models.NodeStatus.Stopped
                     )
+                    # the node has left the init stage and waits for enough balance
+                    self.ready_event.set()
                     await sleep(5)
 
                 # wait the event watcher to start first and then join the network sequentially
@@ -554,6 +576,7 @@ class NodeManager(object):
                     if tx_status == models.TxStatus.Pending:
                         await self.state_cache.set_tx_state(models.TxStatus.Success)
 
+                self.ready_event.set()
                 tg.start_soon(self._sync_state)
 
         finally:
@@ -575,6 +598,7 @@ class NodeManager(object):
                 await self.state_cache.set_node_state(models.NodeStatus.Error, msg)
             await self.stop()
         finally:
+            self.ready_event.set()
             _logger.info("node manager is stopped")
 
     async def stop(self):
@@ -1,4 +1,8 @@
-from typing import Optional, Type
+import math
+from typing import List, Optional, Type
+
+from anyio import BrokenResourceError, ClosedResourceError, create_memory_object_stream
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
 
 from crynux_server import models
 
@@ -27,6 +31,8 @@ class ManagerStateCache(object):
         self.node_state_cache = node_state_cache_cls()
         self.tx_state_cache = tx_state_cache_cls()
 
+        self._node_state_watchers: List[MemoryObjectSendStream[models.NodeState]] = []
+
     async def get_node_state(self) -> models.NodeState:
         return await self.node_state_cache.get()
 
@@ -34,9 +40,19 @@ class ManagerStateCache(object):
         return await self.tx_state_cache.get()
 
     async def set_node_state(self, status: models.NodeStatus, message: str = "", init_message: str = ""):
-        return await self.node_state_cache.set(
-            models.NodeState(status=status, message=message, init_message=init_message)
-        )
+        state = models.NodeState(status=status, message=message, init_message=init_message)
+        await self.node_state_cache.set(state)
+        for send in list(self._node_state_watchers):
+            try:
+                send.send_nowait(state)
+            except (BrokenResourceError, ClosedResourceError):
+                self._node_state_watchers.remove(send)
+
+    def watch_node_state(self) -> MemoryObjectReceiveStream[models.NodeState]:
+        # receive every node state set after subscribing, close the stream to unsubscribe
+        send, receive = create_memory_object_stream(math.inf)
+        self._node_state_watchers.append(send)
+        return receive
 
     async def set_tx_state(self, status: models.TxStatus, error: str = ""):
         return await self.tx_state_cache.set(models.TxState(status=status, error=error))
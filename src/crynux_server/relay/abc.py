@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import BinaryIO, List, Optional
+from typing import AsyncGenerator, BinaryIO, List, Optional
 
 from crynux_server.models import RelayTask
 
@@ -25,6 +25,11 @@ class Relay(ABC):
     @abstractmethod
     async def get_result(self, task_id: int, index: int, dst: BinaryIO): ...
 
+    @abstractmethod
+    def iter_result_chunks(
+        self, task_id: int, index: int
+    ) -> AsyncGenerator[bytes, None]: ...
+
     @abstractmethod
     async def get_result_checkpoint(self, task_id: int, result_checkpoint_dir: str): ...
 
@@ -1,10 +1,12 @@
 import os
 import shutil
+import sys
 from contextlib import contextmanager
+from datetime import datetime
 from tempfile import mkdtemp
-from typing import BinaryIO, Dict, List, Optional
+from typing import AsyncGenerator, BinaryIO, Dict, List, Optional
 
-from anyio import Condition, get_cancelled_exc_class, to_thread
+from anyio import Condition, get_cancelled_exc_class, open_file, to_thread
 
 from crynux_server.models import RelayTask
 from crynux_server.utils import get_task_hash
@@ -13,6 +15,38 @@ from .abc import Relay
 from .exceptions import RelayError
 
 
+def _sendfile(src: BinaryIO, dst: BinaryIO) -> bool:
+    # copy the whole src into dst's fd in the kernel, return False if nothing
+    # has been sent and the caller should fall back to a normal copy
+    sent = 0
+    try:
+        out_fd = dst.fileno()
+        dst.flush()
+        offset = dst.tell()
+        size = os.fstat(src.fileno()).st_size
+        while sent < size:
+            n = os.sendfile(out_fd, src.fileno(), sent, size - sent)
+            if n == 0:
+                break
+            sent += n
+    except (AttributeError, OSError):
+        if sent > 0:
+            raise
+        return False
+
+    # the fd has been written behind the file object, so move it past the sent bytes
+    dst.seek(offset + sent)
+    return True
+
+
+def _copy_result(src_file: str, dst: BinaryIO):
+    with open(src_file, mode="rb") as src:
+        # sendfile only writes to sockets on macOS
+        if sys.platform == "linux" and _sendfile(src, dst):
+            return
+        shutil.copyfileobj(src, dst)
+
+
 class MockRelay(Relay):
     def __init__(self) -> None:
         super().__init__()
@@ -110,20 +144,32 @@ class MockRelay(Relay):
 
                 condition.notify()
 
+    async def _get_result_file(self, task_id: int, index: int) -> str:
+        condition = self.get_condition(task_id=task_id)
+        async with condition:
+            while task_id not in self.task_results:
+                await condition.wait()
+
+        return self.task_results[task_id][index]
+
     async def get_result(self, task_id: int, index: int, dst: BinaryIO):
         with self.wrap_error("getResult"):
-            condition = self.get_condition(task_id=task_id)
-            async with condition:
-                while task_id not in self.task_results:
-                    await condition.wait()
+            src_file = await self._get_result_file(task_id=task_id, index=index)
 
-            src_file = self.task_results[task_id][index]
+            await to_thread.run_sync(_copy_result, src_file, dst)
 
-            def _copy_file_obj():
-                with open(src_file, mode="rb") as src:
-                    shutil.copyfileobj(src, dst)
+    async def iter_result_chunks(
+        self, task_id: int, index: int, chunk_size: int = 64 * 1024
+    ) -> AsyncGenerator[bytes, None]:
+        with self.wrap_error("getResult"):
+            src_file = await self._get_result_file(task_id=task_id, index=index)
 
-            await to_thread.run_sync(_copy_file_obj)
+            async with await open_file(src_file, mode="rb") as src:
+                while True:
+                    chunk = await src.read(chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
 
     async def get_result_checkpoint(self, task_id: int, result_checkpoint_dir: str):
         with self.wrap_error("getResultCheckpoint"):
@@ -136,6 +182,9 @@ class MockRelay(Relay):
 
             await to_thread.run_sync(shutil.copytree, src_dir, result_checkpoint_dir)
 
+    async def now(self) -> int:
+        return int(datetime.now().timestamp())
+
     async def close(self):
         if not self._closed:
             self.tasks = {}
@@ -3,7 +3,7 @@ import os
 import tempfile
 import shutil
 from contextlib import ExitStack
-from typing import BinaryIO, List, Optional
+from typing import AsyncGenerator, BinaryIO, List, Optional
 
 import httpx
 from anyio import wrap_file, to_thread, open_file
@@ -146,19 +146,25 @@ class WebRelay(Relay):
                 raise RelayError(resp.status_code, "uploadTaskResult", message)
 
     async def get_result(self, task_id: int, index: int, dst: BinaryIO):
+        async_dst = wrap_file(dst)
+
+        async for chunk in self.iter_result_chunks(task_id=task_id, index=index):
+            await async_dst.write(chunk)
+
+    async def iter_result_chunks(
+        self, task_id: int, index: int
+    ) -> AsyncGenerator[bytes, None]:
         input = {"task_id": task_id, "image_num": str(index)}
         timestamp, signature = self.signer.sign(input)
 
-        async_dst = wrap_file(dst)
-
         async with self.client.stream(
             "GET",
             f"/v1/inference_tasks/{task_id}/results/{index}",
             params={"timestamp": timestamp, "signature": signature},
         ) as resp:
-            resp = _process_resp(resp, "getTask")
+            resp = _process_resp(resp, "getResult")
             async for chunk in resp.aiter_bytes():
-                await async_dst.write(chunk)
+                yield chunk
 
     async def get_result_checkpoint(self, task_id: int, result_checkpoint_dir: str):
         input = {"task_id": task_id}
@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, Optional, Type, TypeVar
+from typing import Callable, Dict, Optional, TypeVar
 
 from anyio import create_task_group, get_cancelled_exc_class
 from anyio.abc import TaskGroup
@@ -17,6 +17,10 @@ _logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=TaskRunner)
 
+# a TaskRunner subclass, or any callable building a runner from the same keyword arguments,
+# e.g. functools.partial binding extra dependencies to the runner class
+RunnerFactory = Callable[..., TaskRunner]
+
 
 class TaskSystem(object):
     def __init__(
@@ -35,9 +39,9 @@ class TaskSystem(object):
 
         self._runners: Dict[int, TaskRunner] = {}
 
-        self._runner_cls: Type[TaskRunner] = InferenceTaskRunner
+        self._runner_cls: RunnerFactory = InferenceTaskRunner
 
-    def set_runner_cls(self, runner_cls: Type[TaskRunner]):
+    def set_runner_cls(self, runner_cls: RunnerFactory):
         self._runner_cls = runner_cls
 
     @property
@@ -89,8 +89,9 @@ class EventFilter(object):
 
 
 class EventWatcher(object):
-    def __init__(self, contracts: Contracts):
+    def __init__(self, contracts: Contracts, poll_interval: float = 1):
         self.contracts = contracts
+        self.poll_interval = poll_interval
 
         self._event_filters: Dict[int, EventFilter] = {}
         self._next_filter_id: int = 0
@@ -101,10 +102,12 @@ class EventWatcher(object):
         self._tx_hash_queue = Queue[HexBytes](100)
 
     @classmethod
-    def from_contracts(cls, contracts: Contracts) -> "EventWatcher":
+    def from_contracts(
+        cls, contracts: Contracts, poll_interval: float = 1
+    ) -> "EventWatcher":
         assert contracts.initialized, "Contracts has not been initialized!"
 
-        res = cls(contracts)
+        res = cls(contracts, poll_interval=poll_interval)
         return res
 
     def watch_event(
@@ -138,7 +141,7 @@ class EventWatcher(object):
         self,
         from_block: int = 0,
         to_block: int = 0,
-        interval: float = 1,
+        interval: Optional[float] = None,
         *,
         task_status: TaskStatus[None] = TASK_STATUS_IGNORED,
     ):
@@ -147,12 +150,15 @@ class EventWatcher(object):
 
         from_block: a block number, zero means start from the latest block
         to_block: a block number, zero means watch infinitely
-        interval: sleep time, sleep when there is no new block
+        interval: sleep time, sleep when there is no new block, None means the watcher's poll_interval
         """
         assert (
             self._cancel_scope is None
         ), "The watcher has already started. You should stop the watcher before restart it."
 
+        if interval is None:
+            interval = self.poll_interval
+
         try:
             self._cancel_scope = CancelScope()
 
@@ -1,10 +1,12 @@
 import secrets
 
 import pytest
+from anyio import create_task_group, fail_after, sleep_forever, wait_all_tasks_blocked
 from web3 import Web3
 
 from crynux_server import db, models
-from crynux_server.event_queue import DbEventQueue, MemoryEventQueue
+from crynux_server.event_queue import (DbEventQueue, EventBuffer, MemoryEventQueue,
+                                      RingEventQueue)
 
 
 async def test_memory_event_queue():
@@ -53,6 +55,190 @@ async def test_memory_event_queue():
     await queue.ack(ack_id)
 
 
+async def test_ring_event_queue():
+    task_id = 1
+    creator = Web3.to_checksum_address("0xd075aB490857256e6fc85d75d8315e7c9914e008")
+    address = Web3.to_checksum_address("0x577887519278199ce8F8D80bAcc70fc32b48daD4")
+    task_hash = "0x" + secrets.token_bytes(32).hex()
+    data_hash = "0x" + secrets.token_bytes(32).hex()
+    round = 1
+
+    hashes = ["0x0102030405060708"]
+    files = ["test.png"]
+
+    events = [
+        models.TaskStarted(
+            task_id=task_id,
+            task_type=models.TaskType.SD,
+            creator=creator,
+            selected_node=address,
+            task_hash=task_hash,
+            data_hash=data_hash,
+            round=round,
+        ),
+        models.TaskResultReady(task_id=task_id, hashes=hashes, files=files),
+        models.TaskResultCommitmentsReady(task_id=task_id),
+        models.TaskAborted(task_id=task_id, reason=""),
+    ]
+
+    # a small capacity makes the ring wrap around and grow
+    queue = RingEventQueue(capacity=2)
+    await queue.put(events[0])
+    ack_id, event = await queue.get()
+    assert event == events[0]
+    await queue.ack(ack_id)
+
+    for event in events:
+        await queue.put(event)
+    assert queue.capacity == 4
+    assert len(queue) == len(events)
+
+    for i in range(len(events)):
+        ack_id, event = await queue.get()
+        assert event == events[i]
+        await queue.ack(ack_id)
+
+    await queue.put(events[0])
+
+    ack_id, event = await queue.get()
+    assert event == events[0]
+    await queue.no_ack(ack_id)
+
+    ack_id, event = await queue.get()
+    assert event == events[0]
+    await queue.ack(ack_id)
+
+
+async def test_ring_event_queue_wait():
+    task_id = 1
+    event = models.TaskResultCommitmentsReady(task_id=task_id)
+
+    queue = RingEventQueue()
+    result = []
+
+    async def _get():
+        result.append(await queue.get())
+
+    async with create_task_group() as tg:
+        tg.start_soon(_get)
+        await wait_all_tasks_blocked()
+        assert len(result) == 0
+        await queue.put(event)
+
+    ack_id, got = result[0]
+    assert got == event
+    await queue.ack(ack_id)
+
+
+async def test_event_buffer():
+    task_id = 1
+    hashes = ["0x0102030405060708"]
+    files = ["test.png"]
+
+    events = [
+        models.TaskResultReady(task_id=task_id, hashes=hashes, files=files),
+        models.TaskResultCommitmentsReady(task_id=task_id),
+        models.TaskAborted(task_id=task_id, reason=""),
+    ]
+
+    queue = MemoryEventQueue()
+    buffer = EventBuffer(queue, max_size=2)
+
+    async with create_task_group() as tg:
+        tg.start_soon(buffer.run)
+
+        for event in events:
+            buffer.append(event)
+
+        for i in range(len(events)):
+            ack_id, event = await queue.get()
+            assert event == events[i]
+            await queue.ack(ack_id)
+
+        buffer.append(events[0])
+        tg.cancel_scope.cancel()
+
+    # pending events are flushed when the buffer stops
+    assert len(buffer) == 0
+    ack_id, event = await queue.get()
+    assert event == events[0]
+    await queue.ack(ack_id)
+
+
+class _FlakyEventQueue(MemoryEventQueue):
+    def __init__(self, fail_count: int) -> None:
+        super().__init__()
+        self.fail_count = fail_count
+
+    async def put_batch(self, events):
+        if self.fail_count > 0:
+            self.fail_count -= 1
+            raise ValueError("mock put_batch error")
+        await super().put_batch(events)
+
+
+async def test_event_buffer_put_batch_error():
+    task_id = 1
+    events = [
+        models.TaskResultCommitmentsReady(task_id=task_id),
+        models.TaskAborted(task_id=task_id, reason=""),
+    ]
+
+    queue = _FlakyEventQueue(fail_count=2)
+    buffer = EventBuffer(queue, retry_delay=0.01)
+
+    async with create_task_group() as tg:
+        tg.start_soon(buffer.run)
+
+        for event in events:
+            buffer.append(event)
+
+        # the failed batches are retried in order and the flush loop keeps running
+        with fail_after(5):
+            for i in range(len(events)):
+                ack_id, event = await queue.get()
+                assert event == events[i]
+                await queue.ack(ack_id)
+        assert queue.fail_count == 0
+
+        buffer.append(events[0])
+        with fail_after(5):
+            ack_id, event = await queue.get()
+        assert event == events[0]
+        await queue.ack(ack_id)
+
+        tg.cancel_scope.cancel()
+
+
+class _CancelledAfterPutQueue(MemoryEventQueue):
+    # stores the batch and then blocks, like a db commit whose cleanup is cancelled
+    async def put_batch(self, events):
+        await super().put_batch(events)
+        await sleep_forever()
+
+
+async def test_event_buffer_put_batch_cancelled():
+    event = models.TaskAborted(task_id=1, reason="")
+
+    queue = _CancelledAfterPutQueue()
+    buffer = EventBuffer(queue)
+
+    async with create_task_group() as tg:
+        tg.start_soon(buffer.run)
+
+        buffer.append(event)
+        with fail_after(5):
+            ack_id, res = await queue.get()
+        assert res == event
+        await queue.ack(ack_id)
+
+        tg.cancel_scope.cancel()
+
+    # the stored batch is not flushed again when the buffer stops
+    assert len(buffer) == 0
+    assert len(queue.queue) == 0
+
+
 @pytest.fixture(scope="module")
 async def init_db():
     await db.init("sqlite+aiosqlite://")
@@ -1,20 +1,22 @@
+import gc
 import json
 import secrets
 import os
 import shutil
-from io import BytesIO
-from typing import List, Callable, Awaitable
+from functools import partial
+from typing import List, Callable, Awaitable, Optional
 
 import pytest
-from anyio import create_task_group, sleep, fail_after, Event
+from anyio import create_task_group, sleep, fail_after, Event, to_thread
+from anyio.streams.memory import MemoryObjectReceiveStream
 from eth_account import Account
-from PIL import Image
+from PIL import ImageFile
 from web3 import Web3
 
 from crynux_server import models
 from crynux_server.config import Config, TxOption, set_config
 from crynux_server.contracts import Contracts
-from crynux_server.event_queue import EventQueue, MemoryEventQueue
+from crynux_server.event_queue import EventQueue, RingEventQueue
 from crynux_server.node_manager import (
     NodeManager,
     NodeStateManager,
@@ -28,15 +30,67 @@ from crynux_server.relay import MockRelay, Relay
 from crynux_server.task import InferenceTaskRunner, MemoryTaskStateCache, TaskSystem
 from crynux_server.task.state_cache import TaskStateCache
 from crynux_server.utils import get_task_hash
-from crynux_server.watcher import EventWatcher, MemoryBlockNumberCache
-from crynux_server.faucet import MockFaucet, set_faucet
+from crynux_server.watcher import EventWatcher
+from crynux_server.worker_manager import WorkerManager, set_worker_manager
 
-@pytest.fixture
+
+# task args are serialized once at import instead of on every create_task call
+_SD_PROMPT = (
+    "best quality, ultra high res, photorealistic++++, 1girl, off-shoulder sweater, smiling, "
+    "faded ash gray messy bun hair+, border light, depth of field, looking at "
+    "viewer, closeup"
+)
+
+_SD_NEGATIVE_PROMPT = (
+    "paintings, sketches, worst quality+++++, low quality+++++, normal quality+++++, lowres, "
+    "normal quality, monochrome++, grayscale++, skin spots, acnes, skin blemishes, "
+    "age spot, glans"
+)
+
+TASK_ARGS = {
+    models.TaskType.SD: json.dumps(
+        {
+            "base_model": "runwayml/stable-diffusion-v1-5",
+            "prompt": _SD_PROMPT,
+            "negative_prompt": _SD_NEGATIVE_PROMPT,
+            "task_config": {"num_images": 9, "safety_checker": False},
+        }
+    ),
+    models.TaskType.LLM: json.dumps(
+        {
+            "model": "gpt2",
+            "messages": [
+                {
+                    "role": "user",
+                    "content": "I want to create a chat bot. Any suggestions?",
+                }
+            ],
+            "generation_config": {
+                "max_new_tokens": 30,
+            },
+            "seed": 42,
+        }
+    ),
+}
+
+# get_task_hash is a pure keccak of the args
+TASK_HASHES = {
+    task_type: get_task_hash(task_args) for task_type, task_args in TASK_ARGS.items()
+}
+
+DATA_HASH = bytes([0] * 32)
+
+TASK_FEE = Web3.to_wei(30, "ether")
+
+
+@pytest.fixture(scope="session")
 def tx_option():
-    return {}
+    # a fixed gas limit skips the eth_estimateGas round trip on every fixture tx;
+    # it must cover the Task contract deployment and stay under the tester block gas limit
+    return {"gas": 10_000_000}
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def privkeys():
     return [
         "0xa627246a109551432ac5db6535566af34fdddfaa11df17b8afd53eb987e209a2",
@@ -45,24 +99,24 @@ def privkeys():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def gpu_name():
     return "NVIDIA GeForce GTX 1070 Ti"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def gpu_vram():
     return 8
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def provider():
     from web3.providers.eth_tester import AsyncEthereumTesterProvider
 
     provider = AsyncEthereumTesterProvider()
     return provider
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 async def root_contracts(provider, tx_option, privkeys):
     c0 = Contracts(provider=provider, default_account_index=0)
 
@@ -85,40 +139,36 @@ async def root_contracts(provider, tx_option, privkeys):
         await c0.close()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def config():
     test_config = Config.model_validate(
         {
             "log": {"dir": "logs", "level": "INFO"},
             "ethereum": {
-                "privkey": "",
                 "provider": "",
                 "chain_id": None,
                 "gas": None,
                 "gas_price": None,
-                "contract": {"token": "", "node": "", "task": ""},
+                "contract": {"node": "", "task": ""},
             },
-            "task_dir": "task",
-            "db": "",
+            "db": {"driver": "sqlite", "filename": "build/data/server.db"},
             "relay_url": "",
-            "faucet_url": "",
-            "celery": {"broker": "", "backend": ""},
-            "distributed": False,
-            "task_config": {
-                "output_dir": "build/data/images",
-                "hf_cache_dir": "build/data/huggingface",
-                "external_cache_dir": "build/data/external",
-                "inference_logs_dir": "build/data/inference-logs",
-                "script_dir": "stable-diffusion-task",
-                "result_url": "",
-            },
+            "task_config": {"worker_patch_url": ""},
         }
     )
     set_config(test_config)
     return test_config
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+async def worker_manager(config: Config):
+    # inference tasks are sent to the worker connected to the default worker manager
+    worker_manager = WorkerManager(config=config)
+    set_worker_manager(worker_manager)
+    return worker_manager
+
+
+@pytest.fixture(scope="session")
 async def node_contracts(
     provider, root_contracts: Contracts, tx_option: TxOption, privkeys: List[str]
 ):
@@ -128,18 +178,22 @@ async def node_contracts(
     task_queue_contract_address = root_contracts.task_queue_contract.address
     netstats_contract_address = root_contracts.netstats_contract.address
 
-    cs = []
-    for privkey in privkeys:
-        contracts = Contracts(provider=provider, privkey=privkey)
-        await contracts.init(
-            node_contract_address=node_contract_address,
-            task_contract_address=task_contract_address,
-            qos_contract_address=qos_contract_address,
-            task_queue_contract_address=task_queue_contract_address,
-            netstats_contract_address=netstats_contract_address,
-            option=tx_option,
-        )
-        cs.append(contracts)
+    cs = [Contracts(provider=provider, privkey=privkey) for privkey in privkeys]
+
+    # every node has its own account and w3 pool, so they can be initialized concurrently
+    async with create_task_group() as tg:
+        for contracts in cs:
+            tg.start_soon(
+                partial(
+                    contracts.init,
+                    node_contract_address=node_contract_address,
+                    task_contract_address=task_contract_address,
+                    qos_contract_address=qos_contract_address,
+                    task_queue_contract_address=task_queue_contract_address,
+                    netstats_contract_address=netstats_contract_address,
+                    option=tx_option,
+                )
+            )
     try:
         yield cs
     finally:
@@ -148,8 +202,66 @@ async def node_contracts(
 
 
 @pytest.fixture
-def relay():
-    return MockRelay()
+async def relay():
+    # the relay keeps per-task results, so it is recreated for every test
+    # while the chain fixtures above are shared by the whole session
+    relay = MockRelay()
+    try:
+        yield relay
+    finally:
+        await relay.close()
+
+
+class _InferenceTaskRunner(InferenceTaskRunner):
+    def __init__(
+        self,
+        task_id: int,
+        task_name: str,
+        state_cache: TaskStateCache,
+        queue: EventQueue,
+        contracts: Contracts,
+        relay: Relay,
+        watcher: EventWatcher,
+        config: Config,
+        fail_step: int,
+    ) -> None:
+        super().__init__(
+            task_id=task_id,
+            task_name=task_name,
+            state_cache=state_cache,
+            queue=queue,
+            contracts=contracts,
+            relay=relay,
+            watcher=watcher,
+            config=config,
+        )
+        self._fail_step = fail_step
+        self._fail_count = 0
+
+    def _mock_fail(self, step: int):
+        if self._fail_count == 0 and self._fail_step == step:
+            self._fail_count += 1
+            raise ValueError("mock fail")
+
+    async def task_started(self, event, finish_callback):
+        self._mock_fail(1)
+        return await super().task_started(event, finish_callback)
+
+    async def result_ready(self, event, finish_callback):
+        self._mock_fail(2)
+        return await super().result_ready(event, finish_callback)
+
+    async def commitment_ready(self, event, finish_callback):
+        self._mock_fail(3)
+        return await super().commitment_ready(event, finish_callback)
+
+    async def task_success(self, event, finish_callback):
+        self._mock_fail(4)
+        return await super().task_success(event, finish_callback)
+
+    async def task_aborted(self, event, finish_callback):
+        self._mock_fail(5)
+        return await super().task_aborted(event, finish_callback)
 
 
 @pytest.fixture
@@ -158,34 +270,25 @@ async def create_node_managers(
     node_contracts: List[Contracts],
     relay: Relay,
     config: Config,
+    worker_manager: WorkerManager,
     gpu_name: str,
     gpu_vram: int,
 ):
     new_data_dirs = []
+    created_managers: List[NodeManager] = []
 
     async def make_node_managers(fail_step: int):
-        managers = []
+        managers: List[Optional[NodeManager]] = [None] * len(privkeys)
 
-        for i, (privkey, contracts) in enumerate(zip(privkeys, node_contracts)):
-            queue = MemoryEventQueue()
+        # nodes share no state, so bring them up concurrently
+        async def _setup(i: int, privkey: str, contracts: Contracts):
+            queue = RingEventQueue()
 
-            watcher = EventWatcher.from_contracts(contracts)
-            block_number_cache = MemoryBlockNumberCache()
-            watcher.set_blocknumber_cache(block_number_cache)
+            # blocks are mined on every tx by the tester provider, so the default
+            # interval tuned for real chains only delays event detection
+            watcher = EventWatcher.from_contracts(contracts, poll_interval=0.1)
 
-            def make_callback(queue):
-                async def _push_event(event_data):
-                    event = models.load_event_from_contracts(event_data)
-                    await queue.put(event)
-
-                return _push_event
-
-            watcher.watch_event(
-                "task",
-                "TaskStarted",
-                callback=make_callback(queue),
-                filter_args={"selectedNode": contracts.account},
-            )
+            # TaskStarted events are pushed to the queue by NodeManager._watch_events
 
             task_state_cache = MemoryTaskStateCache()
             system = TaskSystem(
@@ -195,71 +298,25 @@ async def create_node_managers(
                 retry=(fail_step > 0),
             )
 
-            assert config.task_config is not None
-            local_config = config.task_config.model_copy()
-            data_dir = os.path.join(local_config.output_dir, f"node_{fail_step}_{i}")
-            if not os.path.exists(data_dir):
-                os.makedirs(data_dir, exist_ok=True)
-            local_config.output_dir = data_dir
+            local_config = config.model_copy(deep=True)
+            assert local_config.task_config is not None
+            data_dir = os.path.join(
+                local_config.task_config.output_dir, f"node_{fail_step}_{i}"
+            )
+            await to_thread.run_sync(partial(os.makedirs, data_dir, exist_ok=True))
+            # output_dir is computed from the private _output_dir, which has no public setter
+            local_config.task_config._output_dir = data_dir
             new_data_dirs.append(data_dir)
 
-            def make_runner_cls(contracts, relay, watcher, local_config, fail_step):
-                class _InferenceTaskRunner(InferenceTaskRunner):
-                    def __init__(
-                        self,
-                        task_id: int,
-                        task_name: str,
-                        distributed: bool,
-                        state_cache: TaskStateCache,
-                        queue: EventQueue,
-                    ) -> None:
-                        super().__init__(
-                            task_id=task_id,
-                            task_name=task_name,
-                            distributed=distributed,
-                            state_cache=state_cache,
-                            queue=queue,
-                            contracts=contracts,
-                            relay=relay,
-                            watcher=watcher,
-                            local_config=local_config,
-                        )
-                        self._fail_count = 0
-
-                    async def task_started(self, event, finish_callback):
-                        if self._fail_count == 0 and fail_step == 1:
-                            self._fail_count += 1
-                            raise ValueError("mock fail")
-                        return await super().task_started(event, finish_callback)
-
-                    async def result_ready(self, event, finish_callback):
-                        if self._fail_count == 0 and fail_step == 2:
-                            self._fail_count += 1
-                            raise ValueError("mock fail")
-                        return await super().result_ready(event, finish_callback)
-
-                    async def commitment_ready(self, event, finish_callback):
-                        if self._fail_count == 0 and fail_step == 3:
-                            self._fail_count += 1
-                            raise ValueError("mock fail")
-                        return await super().commitment_ready(event, finish_callback)
-
-                    async def task_success(self, event, finish_callback):
-                        if self._fail_count == 0 and fail_step == 4:
-                            self._fail_count += 1
-                            raise ValueError("mock fail")
-                        return await super().task_success(event, finish_callback)
-
-                    async def task_aborted(self, event, finish_callback):
-                        if self._fail_count == 0 and fail_step == 5:
-                            self._fail_count += 1
-                            raise ValueError("mock fail")
-                        return await super().task_aborted(event, finish_callback)
-
-                return _InferenceTaskRunner
-
             system.set_runner_cls(
-                make_runner_cls(contracts, relay, watcher, local_config, fail_step)
+                partial(
+                    _InferenceTaskRunner,
+                    contracts=contracts,
+                    relay=relay,
+                    watcher=watcher,
+                    config=local_config,
+                    fail_step=fail_step,
+                )
             )
 
             state_cache = ManagerStateCache(
@@ -269,16 +326,13 @@ async def create_node_managers(
             # set init state to stopped to bypass prefetch stage
             await state_cache.set_node_state(models.NodeStatus.Stopped)
 
-            faucet = MockFaucet()
-            set_faucet(faucet)
-
             state_manager = NodeStateManager(
                 state_cache=state_cache,
                 contracts=contracts,
             )
 
             manager = NodeManager(
-                config=config,
+                config=local_config,
                 gpu_name=gpu_name,
                 gpu_vram=gpu_vram,
                 manager_state_cache=state_cache,
@@ -287,77 +341,59 @@ async def create_node_managers(
                 event_queue=queue,
                 contracts=contracts,
                 relay=relay,
-                faucet=faucet,
                 watcher=watcher,
                 task_system=system,
+                worker_manager=worker_manager,
                 retry=False,
             )
-            managers.append(manager)
+            managers[i] = manager
+
+        async with create_task_group() as tg:
+            for i, (privkey, contracts) in enumerate(zip(privkeys, node_contracts)):
+                tg.start_soon(_setup, i, privkey, contracts)
 
-        return managers
+        res: List[NodeManager] = []
+        for manager in managers:
+            assert manager is not None
+            res.append(manager)
+        created_managers.extend(res)
+        return res
 
     try:
         yield make_node_managers
     finally:
+        # stop is idempotent, and contracts and relay are released by their own fixtures
+        for manager in created_managers:
+            await manager.stop()
+        # drop the managers so the fixture cache doesn't keep them alive
+        created_managers.clear()
+        gc.collect()
+
         for data_dir in new_data_dirs:
             if os.path.exists(data_dir):
                 shutil.rmtree(data_dir)
 
 
 async def create_task(
-    task_type: models.TaskType, contracts: Contracts, relay: Relay, tx_option: TxOption
+    task_type: models.TaskType,
+    contracts: Contracts,
+    relay: Relay,
+    tx_option: TxOption,
+    gpu_name: str,
+    gpu_vram: int,
 ):
-    if task_type == models.TaskType.SD:
-        prompt = (
-            "best quality, ultra high res, photorealistic++++, 1girl, off-shoulder sweater, smiling, "
-            "faded ash gray messy bun hair+, border light, depth of field, looking at "
-            "viewer, closeup"
-        )
-
-        negative_prompt = (
-            "paintings, sketches, worst quality+++++, low quality+++++, normal quality+++++, lowres, "
-            "normal quality, monochrome++, grayscale++, skin spots, acnes, skin blemishes, "
-            "age spot, glans"
-        )
-
-        args = {
-            "base_model": "runwayml/stable-diffusion-v1-5",
-            "prompt": prompt,
-            "negative_prompt": negative_prompt,
-            "task_config": {"num_images": 9, "safety_checker": False},
-        }
-        task_args = json.dumps(args)
-
-        task_hash = get_task_hash(task_args)
-        data_hash = bytes([0] * 32)
-    else:
-        messages = [
-            {"role": "user", "content": "I want to create a chat bot. Any suggestions?"}
-        ]
-        args = {
-            "model": "gpt2",
-            "messages": messages,
-            "generation_config": {
-                "max_new_tokens": 30,
-            },
-            "seed": 42,
-        }
-
-        task_args = json.dumps(args)
-
-        task_hash = get_task_hash(task_args)
-        data_hash = bytes([0] * 32)
-
-    task_fee = Web3.to_wei(30, "ether")
+    task_args = TASK_ARGS[task_type]
     cap = 1
 
     waiter = await contracts.task_contract.create_task(
         task_type=task_type,
-        task_hash=task_hash,
-        data_hash=data_hash,
+        task_hash=TASK_HASHES[task_type],
+        data_hash=DATA_HASH,
         vram_limit=8,
-        task_fee=task_fee,
+        task_fee=TASK_FEE,
         cap=cap,
+        gpu_name=gpu_name,
+        gpu_vram=gpu_vram,
         option=tx_option,
     )
     receipt = await waiter.wait()
@@ -376,46 +412,176 @@ async def create_task(
     return task_id, round_map, receipt["blockNumber"]
 
 
-async def start_nodes(
-    node_managers: List[NodeManager], gpu_name: str, gpu_vram: int, tx_option
+async def wait_nodes_running(
+    watches: List[MemoryObjectReceiveStream[models.NodeState]],
 ):
-    waits = []
-    for m in node_managers:
-        assert m._node_state_manager is not None
-        waits.append(
-            await m._node_state_manager.start(
-                gpu_name=gpu_name, gpu_vram=gpu_vram, option=tx_option
-            )
-        )
+    async def _wait(states: MemoryObjectReceiveStream[models.NodeState]):
+        async with states:
+            async for state in states:
+                assert state.status != models.NodeStatus.Error, state.message
+                if state.status == models.NodeStatus.Running:
+                    break
+
+    async with create_task_group() as tg:
+        for states in watches:
+            tg.start_soon(_wait, states)
+
+
+async def check_task_result(
+    relay: Relay, task_id: int, task_type: models.TaskType, timeout: float = 600
+):
+    # the result only appears after a worker has run the inference, so fail
+    # instead of waiting forever when no worker picks the task up
+    with fail_after(timeout):
+        await _check_task_result(relay, task_id, task_type)
+
+
+async def _check_task_result(relay: Relay, task_id: int, task_type: models.TaskType):
+    chunks = relay.iter_result_chunks(task_id=task_id, index=0)
+    try:
+        if task_type == models.TaskType.SD:
+            # the image size is known once the header is parsed, so stop
+            # reading the result instead of decoding the whole image
+            parser = ImageFile.Parser()
+            async for chunk in chunks:
+                parser.feed(chunk)
+                if parser.image is not None:
+                    break
+            assert parser.image is not None
+            assert parser.image.width == 512
+            assert parser.image.height == 512
+        else:
+            content = b"".join([chunk async for chunk in chunks])
+            resp = json.loads(content)
+            assert resp["model"] == "gpt2"
+            assert len(resp["choices"]) == 1
+            assert len(resp["choices"][0]["message"]["content"]) > 0
+    finally:
+        await chunks.aclose()
+
+
+async def change_nodes_state(
+    node_managers: List[NodeManager],
+    action: str,
+    status: models.NodeStatus,
+    **kwargs,
+):
+    # send the txs of all nodes concurrently, then wait for them concurrently
+    waits: List[Optional[Callable[[], Awaitable[None]]]] = [None] * len(node_managers)
+
+    async def _send_tx(i: int, node_manager: NodeManager):
+        assert node_manager._node_state_manager is not None
+        method = getattr(node_manager._node_state_manager, action)
+        waits[i] = await method(**kwargs)
+
+    async with create_task_group() as sub_tg:
+        for i, m in enumerate(node_managers):
+            sub_tg.start_soon(_send_tx, i, m)
     for n in node_managers:
         assert (await n.state_cache.get_tx_state()).status == models.TxStatus.Pending
     async with create_task_group() as sub_tg:
         for w in waits:
+            assert w is not None
             sub_tg.start_soon(w)
     for n in node_managers:
-        assert (
-            await n.state_cache.get_node_state()
-        ).status == models.NodeStatus.Running
+        assert (await n.state_cache.get_node_state()).status == status
+
+
+def unwatch_task_started(node_managers: List[NodeManager]):
+    for n in node_managers:
+        assert n._watcher is not None
+        for filter_id, event_filter in list(n._watcher._event_filters.items()):
+            if event_filter.event_name == "TaskStarted":
+                n._watcher.unwatch_event(filter_id)
+
+
+async def inject_task_started(
+    node_managers: List[NodeManager], contracts: Contracts, block_number: int
+):
+    events = await contracts.task_contract.get_events(
+        "TaskStarted", from_block=block_number, to_block=block_number
+    )
+    decode = models.make_event_decoder("TaskStarted")
+    queues = {}
+    for n in node_managers:
+        assert n._contracts is not None
+        assert n._event_queue is not None
+        queues[n._contracts.account] = n._event_queue
+
+    for event_data in events:
+        queue = queues[event_data["args"]["selectedNode"]]
+        await queue.put(decode(event_data))
+
+
+async def start_nodes(
+    node_managers: List[NodeManager], gpu_name: str, gpu_vram: int, tx_option
+):
+    await change_nodes_state(
+        node_managers,
+        "start",
+        models.NodeStatus.Running,
+        gpu_name=gpu_name,
+        gpu_vram=gpu_vram,
+        option=tx_option,
+    )
+
+
+async def stop_node_managers(node_managers: List[NodeManager]):
+    async with create_task_group() as sub_tg:
+        for n in node_managers:
+            sub_tg.start_soon(n.stop)
+
+
+async def run_node_managers(node_managers: List[NodeManager]):
+    # dispatched as one task from the test, then fans out to every node
+    async with create_task_group() as tg:
+        for n in node_managers:
+            tg.start_soon(n.run, False)
 
 
 async def wait_nodes_start(node_managers: List[NodeManager]):
-    async def _wait(node_manager: NodeManager):
-        while True:
-            status = (await node_manager.state_cache.get_node_state()).status
-            assert status in [models.NodeStatus.Running, models.NodeStatus.Init]
-            if status != models.NodeStatus.Running:
-                await sleep(1)
-            else:
-                break
-    
     async with create_task_group() as tg:
         for node_manager in node_managers:
-            tg.start_soon(_wait, node_manager)
+            tg.start_soon(node_manager.ready_event.wait)
+
+    for node_manager in node_managers:
+        status = (await node_manager.state_cache.get_node_state()).status
+        assert status == models.NodeStatus.Running
+
+
+async def test_lifecycle_transitions(
+    create_node_managers: Callable[[int], Awaitable[List[NodeManager]]],
+    tx_option,
+):
+    node_managers = await create_node_managers(0)
+
+    async with create_task_group() as tg:
+        tg.start_soon(run_node_managers, node_managers)
+
+        await wait_nodes_start(node_managers)
+
+        await change_nodes_state(
+            node_managers, "pause", models.NodeStatus.Paused, option=tx_option
+        )
+
+        await change_nodes_state(
+            node_managers, "resume", models.NodeStatus.Running, option=tx_option
+        )
+
+        await change_nodes_state(
+            node_managers, "stop", models.NodeStatus.Stopped, option=tx_option
+        )
+
+        # contracts are shared across the session and closed by the node_contracts fixture
+        await stop_node_managers(node_managers)
+        tg.cancel_scope.cancel()
 
 
+@pytest.mark.slow
 @pytest.mark.parametrize("fail_step", [0, 1, 2, 3])
 @pytest.mark.parametrize("task_type", [models.TaskType.SD, models.TaskType.LLM])
-async def test_node_manager(
+@pytest.mark.parametrize("mode", ["onchain", "inject"])
+async def test_task_end_to_end(
     create_node_managers: Callable[[int], Awaitable[List[NodeManager]]],
     node_contracts: List[Contracts],
     relay: Relay,
@@ -424,92 +590,45 @@ async def test_node_manager(
     gpu_vram: int,
     fail_step: int,
     task_type: models.TaskType,
+    mode: str,
 ):
     node_managers = await create_node_managers(fail_step)
 
     async with create_task_group() as tg:
-        for n in node_managers:
-            tg.start_soon(n.run, False)
+        tg.start_soon(run_node_managers, node_managers)
 
-        # await start_nodes(node_managers, gpu_name, gpu_vram, tx_option)
         await wait_nodes_start(node_managers)
 
-        task_id, _, _ = await create_task(
-            task_type, node_contracts[0], relay, tx_option=tx_option
+        if mode == "inject":
+            # the test delivers TaskStarted itself, so the watchers must not deliver it again
+            unwatch_task_started(node_managers)
+
+        task_id, _, block_number = await create_task(
+            task_type,
+            node_contracts[0],
+            relay,
+            tx_option=tx_option,
+            gpu_name=gpu_name,
+            gpu_vram=gpu_vram,
         )
+        if mode == "inject":
+            # push the events to the queues without waiting for a watcher round trip
+            await inject_task_started(node_managers, node_contracts[0], block_number)
 
-        with BytesIO() as dst:
-            await relay.get_result(task_id=task_id, index=0, dst=dst)
-            dst.seek(0)
-            if task_type == models.TaskType.SD:
-                img = Image.open(dst)
-                assert img.width == 512
-                assert img.height == 512
-            else:
-                resp = json.load(dst)
-                assert resp["model"] == "gpt2"
-                assert len(resp["choices"]) == 1
-                assert len(resp["choices"][0]["message"]["content"]) > 0
-
-        waits = []
-        for m in node_managers:
-            assert m._node_state_manager is not None
-            waits.append(await m._node_state_manager.pause(option=tx_option))
-        for n in node_managers:
-            assert (
-                await n.state_cache.get_tx_state()
-            ).status == models.TxStatus.Pending
-        async with create_task_group() as sub_tg:
-            for w in waits:
-                sub_tg.start_soon(w)
-
-        for n in node_managers:
-            assert (
-                await n.state_cache.get_node_state()
-            ).status == models.NodeStatus.Paused
-
-        waits = []
-        for m in node_managers:
-            assert m._node_state_manager is not None
-            waits.append(await m._node_state_manager.resume(option=tx_option))
-        for n in node_managers:
-            assert (
-                await n.state_cache.get_tx_state()
-            ).status == models.TxStatus.Pending
-        async with create_task_group() as sub_tg:
-            for w in waits:
-                sub_tg.start_soon(w)
+        await check_task_result(relay, task_id, task_type)
 
-        for n in node_managers:
-            assert (
-                await n.state_cache.get_node_state()
-            ).status == models.NodeStatus.Running
-
-        waits = []
-        for m in node_managers:
-            assert m._node_state_manager is not None
-            waits.append(await m._node_state_manager.stop(option=tx_option))
-        for n in node_managers:
-            assert (
-                await n.state_cache.get_tx_state()
-            ).status == models.TxStatus.Pending
-        async with create_task_group() as sub_tg:
-            for w in waits:
-                sub_tg.start_soon(w)
-
-        for n in node_managers:
-            assert (
-                await n.state_cache.get_node_state()
-            ).status == models.NodeStatus.Stopped
+        await change_nodes_state(
+            node_managers, "stop", models.NodeStatus.Stopped, option=tx_option
+        )
 
-        for n in node_managers:
-            await n.stop()
-            await n.close()
+        # contracts are shared across the session and closed by the node_contracts fixture
+        await stop_node_managers(node_managers)
         tg.cancel_scope.cancel()
 
 
 @pytest.mark.parametrize("task_type", [models.TaskType.SD, models.TaskType.LLM])
 async def test_node_manager_auto_cancel(
+    provider,
     root_contracts: Contracts,
     create_node_managers: Callable[[int], Awaitable[List[NodeManager]]],
     node_contracts: List[Contracts],
@@ -527,7 +646,12 @@ async def test_node_manager_auto_cancel(
             await start_nodes(node_managers, gpu_name, gpu_vram, tx_option)
 
             task_id, _, _ = await create_task(
-                task_type, node_contracts[0], relay, tx_option=tx_option
+                task_type,
+                node_contracts[0],
+                relay,
+                tx_option=tx_option,
+                gpu_name=gpu_name,
+                gpu_vram=gpu_vram,
             )
 
             cancel_event = Event()
@@ -545,6 +669,9 @@ async def test_node_manager_auto_cancel(
             )
 
             await sleep(2)
+            # the tester chain stamps a block when the previous one is mined,
+            # so mine an empty block to move the chain time past the deadline
+            provider.ethereum_tester.mine_blocks()
 
             tg.start_soon(node_managers[0].run, False)
 
@@ -579,7 +706,12 @@ async def partial_run_task(
 
     # create task
     task_id, round_map, block_number = await create_task(
-        task_type, node_contracts[0], relay, tx_option=tx_option
+        task_type,
+        node_contracts[0],
+        relay,
+        tx_option=tx_option,
+        gpu_name=gpu_name,
+        gpu_vram=gpu_vram,
     )
 
     result = bytes.fromhex("0102030405060708")
@@ -600,7 +732,6 @@ async def partial_run_task(
         assert len(events) == 1
         event = events[0]
         assert event["args"]["taskId"] == task_id
-        config.last_result = "0x0102030405060708"
 
     if 2 <= stage:
         # disclose task
@@ -623,7 +754,10 @@ async def partial_run_task(
         assert event["args"]["taskId"] == task_id
         assert event["args"]["result"] == result
 
+    return task_id
 
+
+@pytest.mark.slow
 @pytest.mark.parametrize("stage", [0, 1, 2])
 @pytest.mark.parametrize("task_type", [models.TaskType.SD, models.TaskType.LLM])
 async def test_node_manager_with_recover(
@@ -638,7 +772,7 @@ async def test_node_manager_with_recover(
     task_type: models.TaskType,
 ):
     node_managers = await create_node_managers(0)
-    await partial_run_task(
+    task_id = await partial_run_task(
         config=config,
         node_managers=node_managers,
         node_contracts=node_contracts,
@@ -649,45 +783,19 @@ async def test_node_manager_with_recover(
         stage=stage,
         task_type=task_type,
     )
+    # subscribe before running the managers, they go through Init again before rejoining
+    watches = [n.watch_state() for n in node_managers]
+
     async with create_task_group() as tg:
-        for n in node_managers:
-            tg.start_soon(n.run, False)
+        tg.start_soon(run_node_managers, node_managers)
 
-        for n in node_managers:
-            assert (
-                await n.state_cache.get_node_state()
-            ).status == models.NodeStatus.Running
-
-        with BytesIO() as dst:
-            await relay.get_result(task_id=1, index=0, dst=dst)
-            dst.seek(0)
-            if task_type == models.TaskType.SD:
-                img = Image.open(dst)
-                assert img.width == 512
-                assert img.height == 512
-            else:
-                resp = json.load(dst)
-                assert resp["model"] == "gpt2"
-                assert len(resp["choices"]) == 1
-                assert len(resp["choices"][0]["message"]["content"]) > 0
-
-        waits = []
-        for m in node_managers:
-            assert m._node_state_manager is not None
-            waits.append(await m._node_state_manager.stop(option=tx_option))
-        for n in node_managers:
-            assert (
-                await n.state_cache.get_tx_state()
-            ).status == models.TxStatus.Pending
-        async with create_task_group() as sub_tg:
-            for w in waits:
-                sub_tg.start_soon(w)
+        await wait_nodes_running(watches)
 
-        for n in node_managers:
-            assert (
-                await n.state_cache.get_node_state()
-            ).status == models.NodeStatus.Stopped
+        await check_task_result(relay, task_id, task_type)
 
-        for n in node_managers:
-            await n.stop()
+        await change_nodes_state(
+            node_managers, "stop", models.NodeStatus.Stopped, option=tx_option
+        )
+
+        await stop_node_managers(node_managers)
         tg.cancel_scope.cancel()
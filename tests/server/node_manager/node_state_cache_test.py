@@ -100,3 +100,31 @@ async def test_manager_state_cache(init_db):
         _state = await state_cache.get_tx_state()
         assert _state.status == status
         assert _state.error == msg
+
+
+async def test_manager_state_cache_watch():
+    state_cache = ManagerStateCache(
+        node_state_cache_cls=MemoryNodeStateCache,
+        tx_state_cache_cls=MemoryTxStateCache,
+    )
+
+    statuses = [
+        models.NodeStatus.Init,
+        models.NodeStatus.Running,
+        models.NodeStatus.Stopped,
+    ]
+
+    states = state_cache.watch_node_state()
+    for status in statuses:
+        await state_cache.set_node_state(status=status)
+
+    async with states:
+        for status in statuses:
+            state = await states.receive()
+            assert state.status == status
+
+    # the closed watcher is dropped on the next state change
+    assert len(state_cache._node_state_watchers) == 1
+    await state_cache.set_node_state(status=models.NodeStatus.Running)
+    assert len(state_cache._node_state_watchers) == 0
+    assert (await state_cache.get_node_state()).status == models.NodeStatus.Running
@@ -0,0 +1,87 @@
+import errno
+import io
+import os
+import secrets
+import shutil
+from tempfile import mkdtemp
+
+import pytest
+
+from crynux_server.relay import MockRelay, RelayError
+
+
+@pytest.fixture
+async def relay():
+    relay = MockRelay()
+    try:
+        yield relay
+    finally:
+        await relay.close()
+
+
+@pytest.fixture
+def result_file():
+    tmp_dir = mkdtemp()
+    filename = os.path.join(tmp_dir, "0.png")
+    # larger than one chunk of iter_result_chunks
+    content = secrets.token_bytes(200 * 1024)
+    with open(filename, mode="wb") as f:
+        f.write(content)
+
+    try:
+        yield filename, content
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+async def test_mock_relay_get_result(relay: MockRelay, result_file, tmp_path):
+    task_id = 1
+    filename, content = result_file
+    await relay.upload_task_result(task_id, [filename])
+
+    dst = io.BytesIO()
+    await relay.get_result(task_id, 0, dst)
+    assert dst.getvalue() == content
+
+    dst_file = tmp_path / "result.png"
+    with open(dst_file, mode="wb") as f:
+        f.write(b"head")
+        await relay.get_result(task_id, 0, f)
+    assert dst_file.read_bytes() == b"head" + content
+
+    chunks = [chunk async for chunk in relay.iter_result_chunks(task_id, 0)]
+    assert len(chunks) > 1
+    assert b"".join(chunks) == content
+
+
+async def test_mock_relay_get_result_error(relay: MockRelay, result_file):
+    task_id = 1
+    filename, _ = result_file
+    await relay.upload_task_result(task_id, [filename])
+
+    with pytest.raises(RelayError):
+        await relay.get_result(task_id, 1, io.BytesIO())
+
+    # the stored result disappears after it is uploaded
+    os.remove(relay.task_results[task_id][0])
+    with pytest.raises(RelayError):
+        await relay.get_result(task_id, 0, io.BytesIO())
+
+
+async def test_mock_relay_get_result_sendfile_error(
+    relay: MockRelay, result_file, tmp_path, monkeypatch
+):
+    task_id = 1
+    filename, content = result_file
+    await relay.upload_task_result(task_id, [filename])
+
+    def _sendfile(*args):
+        raise OSError(errno.EINVAL, "sendfile is not supported")
+
+    # falls back to a normal copy when the kernel refuses sendfile
+    monkeypatch.setattr(os, "sendfile", _sendfile, raising=False)
+
+    dst_file = tmp_path / "result.png"
+    with open(dst_file, mode="wb") as f:
+        await relay.get_result(task_id, 0, f)
+    assert dst_file.read_bytes() == content